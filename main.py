@@ -8,40 +8,58 @@ import os
 import re
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+# tinytag est optionnel: sans lui, seuls les noms de fichiers sont utilisés
+try:
+    from tinytag import TinyTag
+except ImportError:
+    TinyTag = None
+
 # Extensions audio supportées
-AUDIO_EXTENSIONS = {'.mp3', '.flac', '.m4a', '.ogg', '.wav', '.wma', '.aac', '.opus'}
+AUDIO_EXTENSIONS = frozenset({'.mp3', '.flac', '.m4a', '.ogg', '.wav', '.wma', '.aac', '.opus'})
+_AUDIO_SUFFIXES = tuple(AUDIO_EXTENSIONS)  # Pour str.endswith
+
+# Mots-clés signalant une parenthèse à supprimer: (Free Download), (Original Mix), etc.
+# Les variantes les plus longues sont placées avant les plus courtes (original mix avant mix).
+PAREN_NOISE_KEYWORDS = [
+    r'free', r'download', r'premiere',
+    r'original\s*mix', r'extended\s*mix', r'radio\s*edit', r'club\s*mix',
+    r'remix', r'bootleg', r'edit', r'version', r'mix',
+]
 
-# Patterns à nettoyer dans les noms de fichiers
+# Une seule alternance au lieu d'une passe par mot-clé; [^)] empêche de déborder sur
+# les parenthèses voisines
+PAREN_NOISE_PATTERN = r'\([^)]*?(?:' + '|'.join(PAREN_NOISE_KEYWORDS) + r')[^)]*?\)'
+
+# Patterns supprimés des noms de fichiers. Ils commencent par des caractères distincts
+# et sont fusionnés en une seule alternance: le nom n'est parcouru qu'une fois.
+# Chacun exige son caractère d'ouverture, ce qui permet d'éviter la regex sans '#[('.
 CLEANUP_PATTERNS = [
-    r'#[^#]+#',           # #FREE DL#, #PREMIERE#, etc.
-    r'\[.*?\]',           # [Free Download], [Official], etc.
-    r'\(.*?free.*?\)',    # (free download), (FREE), etc. (insensible à la casse)
-    r'\(.*?download.*?\)',# (download), (Free Download), etc.
-    r'\(.*?premiere.*?\)',# (premiere), (PREMIERE), etc.
-    r'\(.*?original\s*mix.*?\)',  # (Original Mix)
-    r'\(.*?extended\s*mix.*?\)',  # (Extended Mix)
-    r'\(.*?radio\s*edit.*?\)',    # (Radio Edit)
-    r'\(.*?club\s*mix.*?\)',      # (Club Mix)
-    r'\d{5,}',            # Chiffres aléatoires (5+ chiffres) n'importe où
-    r'_+',                # Underscores multiples -> espace
-    r'\s+',               # Espaces multiples -> espace unique
+    r'#[^#]+#',                          # #FREE DL#, #PREMIERE#, etc.
+    r'\[.*?\]',                          # [Free Download], [Official], etc.
+    PAREN_NOISE_PATTERN,                 # (Free Download), (Original Mix), (Remix), etc.
 ]
 
+# Patterns compilés une seule fois au chargement du module
+_CLEANUP_RE = re.compile('|'.join(CLEANUP_PATTERNS), re.IGNORECASE)
+# Chiffres aléatoires (5+ chiffres) n'importe où. Pas d'ancrage (?<!\d)...(?!\d) ni de
+# parcours Python: le pattern simple est le plus rapide
+_DIGITS_RE = re.compile(r'\d{5,}')
+_WHITESPACE_RE = re.compile(r'\s+')
+_DASH_RE = re.compile(r'\s*-\s*')
 
-def try_import_tinytag():
-    """Tente d'importer tinytag pour les métadonnées audio."""
-    try:
-        from tinytag import TinyTag
-        return TinyTag
-    except ImportError:
-        return None
+# Nombre de lignes du rapport de scan_folder écrites en une seule fois
+REPORT_BATCH_LINES = 100
+
+# Caractères interdits dans les noms de fichiers Windows (table de suppression)
+_FORBIDDEN_CHARS_TABLE = str.maketrans('', '', '<>:"/\\|?*')
 
 
 def get_metadata(filepath: Path):
     """Récupère les métadonnées artist et title d'un fichier audio."""
-    TinyTag = try_import_tinytag()
     if TinyTag is None:
         return None, None
 
@@ -54,45 +72,40 @@ def get_metadata(filepath: Path):
         return None, None
 
 
+# Les mêmes artistes reviennent souvent dans un dossier: on mémorise les résultats
+@lru_cache(maxsize=4096)
 def clean_filename(name: str) -> str:
     """Nettoie un nom de fichier des éléments indésirables."""
     cleaned = name
 
+    # Les tests "in" sont bien moins coûteux qu'une regex qui ne trouve rien:
+    # chaque étape n'est exécutée que si elle peut modifier le nom
+
     # Supprimer les patterns indésirables
-    cleaned = re.sub(r'#[^#]+#', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\[.*?\]', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\(.*?free.*?\)', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\(.*?download.*?\)', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\(.*?premiere.*?\)', '', cleaned, flags=re.IGNORECASE)
-
-    # Supprimer les patterns de type mix/version
-    cleaned = re.sub(r'\(.*?original\s*mix.*?\)', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\(.*?extended\s*mix.*?\)', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\(.*?radio\s*edit.*?\)', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\(.*?club\s*mix.*?\)', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\(.*?remix.*?\)', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\(.*?bootleg.*?\)', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\(.*?edit.*?\)', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\(.*?version.*?\)', '', cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r'\(.*?mix.*?\)', '', cleaned, flags=re.IGNORECASE)
-
-    # Supprimer les chiffres aléatoires (5+ chiffres) n'importe où dans le nom
-    cleaned = re.sub(r'\d{5,}', '', cleaned)
+    if '#' in cleaned or '[' in cleaned or '(' in cleaned:
+        cleaned = _CLEANUP_RE.sub('', cleaned)
+
+    # Supprimer les chiffres aléatoires (5+ chiffres)
+    cleaned = _DIGITS_RE.sub('', cleaned)
 
     # Remplacer underscores par espaces
-    cleaned = re.sub(r'_+', ' ', cleaned)
+    if '_' in cleaned:
+        cleaned = cleaned.replace('_', ' ')
 
-    # Nettoyer les espaces multiples
-    cleaned = re.sub(r'\s+', ' ', cleaned)
+    # Nettoyer les espaces multiples; tout blanc autre que ' ' est non imprimable
+    if '  ' in cleaned or not cleaned.isprintable():
+        cleaned = _WHITESPACE_RE.sub(' ', cleaned)
 
     # Supprimer espaces autour du tiret séparateur
-    cleaned = re.sub(r'\s*-\s*', ' - ', cleaned)
+    if '-' in cleaned:
+        cleaned = _DASH_RE.sub(' - ', cleaned)
 
     # Supprimer espaces en début/fin
     cleaned = cleaned.strip()
 
     # Supprimer tiret orphelin en fin
-    cleaned = re.sub(r'\s*-\s*$', '', cleaned)
+    if cleaned.endswith('-'):
+        cleaned = cleaned[:-1].rstrip()
 
     return cleaned
 
@@ -109,11 +122,9 @@ def parse_filename(filename: str) -> tuple:
     name = clean_filename(name)
 
     # Chercher le séparateur artiste - titre
-    if ' - ' in name:
-        parts = name.split(' - ', 1)
-        artist = parts[0].strip()
-        title = parts[1].strip() if len(parts) > 1 else ''
-        return artist, title
+    artist, separator, title = name.partition(' - ')
+    if separator:
+        return artist.strip(), title.strip()
 
     # Si pas de séparateur, retourner le nom nettoyé comme titre
     return None, name
@@ -129,49 +140,70 @@ def generate_new_name(artist: str, title: str, extension: str) -> str:
         return None
 
     # Nettoyer les caractères interdits dans les noms de fichiers Windows
-    forbidden_chars = '<>:"/\\|?*'
-    for char in forbidden_chars:
-        new_name = new_name.replace(char, '')
+    new_name = new_name.translate(_FORBIDDEN_CHARS_TABLE)
 
     return f"{new_name}{extension.lower()}"
 
 
-def get_unique_filepath(filepath: Path) -> Path:
-    """Génère un chemin unique si le fichier existe déjà."""
-    if not filepath.exists():
-        return filepath
+def list_existing_names(folder: Path) -> set:
+    """
+    Retourne les noms présents dans un dossier, normalisés avec os.path.normcase
+    (insensibles à la casse sous Windows uniquement).
+    """
+    with os.scandir(folder) as entries:
+        return {os.path.normcase(entry.name) for entry in entries}
+
 
+def get_unique_filepath(filepath: Path, existing_names: set = None) -> Path:
+    """
+    Génère un chemin unique si le fichier existe déjà.
+    existing_names (voir list_existing_names) évite un appel système par essai:
+    seul le chemin retenu est vérifié sur le disque.
+    """
     base = filepath.stem
     ext = filepath.suffix
     parent = filepath.parent
+
+    if existing_names is None:
+        if not filepath.exists():
+            return filepath
+
+        counter = 1
+        while True:
+            new_name = f"{base} ({counter}){ext}"
+            new_path = parent / new_name
+            if not new_path.exists():
+                return new_path
+            counter += 1
+
+    candidate = filepath
     counter = 1
 
     while True:
-        new_name = f"{base} ({counter}){ext}"
-        new_path = parent / new_name
-        if not new_path.exists():
-            return new_path
+        # normcase n'ignore la casse que sous Windows: un volume insensible à la
+        # casse ailleurs (APFS, exFAT, FAT...) peut contenir le nom sous une autre
+        # casse, d'où la confirmation sur le disque avant de retenir un chemin
+        if os.path.normcase(candidate.name) not in existing_names and not os.path.exists(candidate):
+            return candidate
+        candidate = parent / f"{base} ({counter}){ext}"
         counter += 1
 
 
-def process_file(filepath: Path, dry_run: bool = False) -> tuple:
+def compute_new_name(filepath: Path, extension: str = None) -> str:
     """
-    Traite un fichier audio et le renomme.
-    Retourne (success, old_name, new_name, message)
+    Détermine le nouveau nom d'un fichier audio, sans le renommer.
+    extension (en minuscules) peut être fournie si elle est déjà connue.
+    Retourne None si le nom ne peut pas être déterminé.
     """
-    old_name = filepath.name
-    extension = filepath.suffix.lower()
-
-    # Vérifier si c'est un fichier audio
-    if extension not in AUDIO_EXTENSIONS:
-        return False, old_name, None, "Extension non supportée"
+    if extension is None:
+        extension = filepath.suffix.lower()
 
     # Essayer d'abord les métadonnées
     artist, title = get_metadata(filepath)
 
     # Si pas de métadonnées, parser le nom de fichier
     if not artist or not title:
-        parsed_artist, parsed_title = parse_filename(old_name)
+        parsed_artist, parsed_title = parse_filename(filepath.name)
         artist = artist or parsed_artist
         title = title or parsed_title
     else:
@@ -180,7 +212,17 @@ def process_file(filepath: Path, dry_run: bool = False) -> tuple:
         title = clean_filename(title) if title else None
 
     # Générer le nouveau nom
-    new_name = generate_new_name(artist, title, extension)
+    return generate_new_name(artist, title, extension)
+
+
+def apply_new_name(filepath: Path, new_name: str, dry_run: bool = False,
+                   existing_names: set = None) -> tuple:
+    """
+    Renomme un fichier avec le nom calculé par compute_new_name.
+    existing_names (noms du dossier parent) est mis à jour après chaque renommage.
+    Retourne (success, old_name, new_name, message)
+    """
+    old_name = filepath.name
 
     if not new_name:
         return False, old_name, None, "Impossible de déterminer le nouveau nom"
@@ -190,12 +232,17 @@ def process_file(filepath: Path, dry_run: bool = False) -> tuple:
         return True, old_name, new_name, "Déjà correct"
 
     # Chemin du nouveau fichier
-    new_filepath = get_unique_filepath(filepath.parent / new_name)
+    new_filepath = get_unique_filepath(filepath.parent / new_name, existing_names)
     final_new_name = new_filepath.name
 
     if not dry_run:
         try:
-            filepath.rename(new_filepath)
+            # os.rename plutôt que os.replace: sous Windows il refuse d'écraser
+            # un fichier apparu entre-temps au lieu de le supprimer
+            os.rename(filepath, new_filepath)
+            if existing_names is not None:
+                existing_names.discard(os.path.normcase(old_name))
+                existing_names.add(os.path.normcase(final_new_name))
             return True, old_name, final_new_name, "Renommé"
         except Exception as e:
             return False, old_name, final_new_name, f"Erreur: {e}"
@@ -203,6 +250,62 @@ def process_file(filepath: Path, dry_run: bool = False) -> tuple:
         return True, old_name, final_new_name, "À renommer (dry-run)"
 
 
+def process_file(filepath: Path, dry_run: bool = False) -> tuple:
+    """
+    Traite un fichier audio et le renomme.
+    Retourne (success, old_name, new_name, message)
+    """
+    extension = filepath.suffix.lower()
+
+    # Vérifier si c'est un fichier audio
+    if extension not in AUDIO_EXTENSIONS:
+        return False, filepath.name, None, "Extension non supportée"
+
+    return apply_new_name(filepath, compute_new_name(filepath, extension), dry_run)
+
+
+def iter_audio_folders(folder_path: Path, recursive: bool = False):
+    """
+    Parcourt un dossier (et ses sous-dossiers si recursive) dossier par dossier,
+    dans l'ordre alphabétique.
+    Génère des tuples (dossier, fichiers) où fichiers est la liste triée des
+    (filepath, extension en minuscules) des fichiers audio de ce dossier.
+    Utilise os.scandir pour éviter un stat() et un objet Path par fichier ignoré.
+    """
+    pending = [os.fspath(folder_path)]
+
+    while pending:
+        folder = pending.pop()
+        audio_entries = []
+        subfolders = []
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    # Filtrer sur le nom brut avant toute construction de Path;
+                    # dot > 0 exclut les fichiers cachés comme ".mp3" (sans suffixe)
+                    name = entry.name.lower()
+                    if name.endswith(_AUDIO_SUFFIXES) and entry.is_file():
+                        dot = name.rfind('.')
+                        if dot > 0:
+                            sort_key = os.path.normcase(entry.name)
+                            audio_entries.append((sort_key, entry.path, name[dot:]))
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        subfolders.append((os.path.normcase(entry.name), entry.path))
+        except PermissionError:
+            # Dossier inaccessible: on l'ignore comme le faisait glob/rglob
+            continue
+
+        # Tri local par nom (comparaisons de chaînes courtes) plutôt qu'un tri global
+        # des chemins; les sous-dossiers sont empilés à l'envers pour être visités
+        # dans l'ordre alphabétique
+        subfolders.sort(reverse=True)
+        pending.extend(path for _, path in subfolders)
+
+        if audio_entries:
+            audio_entries.sort()
+            yield Path(folder), [(Path(path), extension) for _, path, extension in audio_entries]
+
+
 def scan_folder(folder_path: Path, recursive: bool = False, dry_run: bool = False):
     """Scanne un dossier et renomme les fichiers audio."""
     if not folder_path.exists():
@@ -213,46 +316,70 @@ def scan_folder(folder_path: Path, recursive: bool = False, dry_run: bool = Fals
         print(f"❌ Erreur: '{folder_path}' n'est pas un dossier.")
         return
 
-    # Collecter les fichiers
-    if recursive:
-        files = list(folder_path.rglob('*'))
-    else:
-        files = list(folder_path.glob('*'))
-
-    audio_files = [f for f in files if f.is_file() and f.suffix.lower() in AUDIO_EXTENSIONS]
-
-    if not audio_files:
-        print("ℹ️  Aucun fichier audio trouvé dans le dossier.")
-        return
-
-    print(f"\n📁 Dossier: {folder_path}")
-    print(f"🎵 {len(audio_files)} fichier(s) audio trouvé(s)")
-    if dry_run:
-        print("🔍 Mode prévisualisation (dry-run) - aucune modification ne sera effectuée\n")
-    else:
-        print()
-
+    total_count = 0
     success_count = 0
     skip_count = 0
     error_count = 0
 
-    for filepath in sorted(audio_files):
-        success, old_name, new_name, message = process_file(filepath, dry_run)
-
-        if success:
-            if message == "Déjà correct":
-                skip_count += 1
-                print(f"  ⏭️  {old_name} (déjà correct)")
-            else:
-                success_count += 1
-                print(f"  ✅ {old_name}")
-                print(f"      → {new_name}")
-        else:
-            error_count += 1
-            print(f"  ❌ {old_name} - {message}")
+    # La lecture des tags (I/O) est parallélisée; les renommages restent séquentiels
+    # pour que la gestion des conflits de noms reste fiable
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Les fichiers sont traités dossier par dossier, sans tout charger en mémoire
+        for folder, audio_files in iter_audio_folders(folder_path, recursive):
+            if total_count == 0:
+                print(f"\n📁 Dossier: {folder_path}")
+                if dry_run:
+                    print("🔍 Mode prévisualisation (dry-run) - aucune modification ne sera effectuée\n")
+                else:
+                    print()
+            total_count += len(audio_files)
+
+            new_names = executor.map(
+                compute_new_name,
+                [filepath for filepath, _ in audio_files],
+                [extension for _, extension in audio_files],
+            )
+            existing_names = list_existing_names(folder)
+
+            # Le rapport est écrit par blocs plutôt qu'en un print par ligne; le
+            # finally garantit qu'aucun renommage effectué ne reste non affiché
+            # (erreur, Ctrl+C)
+            lines = []
+
+            try:
+                for (filepath, _), planned_name in zip(audio_files, new_names):
+                    success, old_name, new_name, message = apply_new_name(
+                        filepath, planned_name, dry_run, existing_names
+                    )
+
+                    if success:
+                        if message == "Déjà correct":
+                            skip_count += 1
+                            lines.append(f"  ⏭️  {old_name} (déjà correct)")
+                        else:
+                            success_count += 1
+                            lines.append(f"  ✅ {old_name}")
+                            lines.append(f"      → {new_name}")
+                    else:
+                        error_count += 1
+                        lines.append(f"  ❌ {old_name} - {message}")
+
+                    if len(lines) >= REPORT_BATCH_LINES:
+                        report = '\n'.join(lines)
+                        lines.clear()
+                        print(report, flush=True)
+            finally:
+                if lines:
+                    print('\n'.join(lines), flush=True)
+
+    if total_count == 0:
+        print("ℹ️  Aucun fichier audio trouvé dans le dossier.")
+        return
 
     # Résumé
     print(f"\n📊 Résumé:")
+    print(f"   🎵 Fichiers audio: {total_count}")
     print(f"   ✅ Renommés: {success_count}")
     print(f"   ⏭️  Ignorés: {skip_count}")
     print(f"   ❌ Erreurs: {error_count}")